@@ -13,7 +13,7 @@ import re
 import asyncio
 from typing import AsyncGenerator
 import anthropic
-from tools import TOOL_DEFINITIONS, execute_tool
+from tools import TOOL_DEFINITIONS, execute_tools
 
 client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY", ""))
 
@@ -249,11 +249,11 @@ async def run_planner_agent(
                 seen_tools.add(tc.name)
 
         # Execute all tool calls concurrently
-        async def _run(tc):
-            result_str = await execute_tool(tc.name, tc.input)
-            return tc.id, tc.name, result_str
-
-        tool_results_raw = await asyncio.gather(*[_run(tc) for tc in tool_calls])
+        result_strs = await execute_tools([(tc.name, tc.input) for tc in tool_calls])
+        tool_results_raw = [
+            (tc.id, tc.name, result_str)
+            for tc, result_str in zip(tool_calls, result_strs)
+        ]
 
         # Emit tool result data to frontend (for optional display)
         for tool_id, tool_name, result_str in tool_results_raw:
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 import json
 import asyncio
 from agent import run_planner_agent
+from tools import close_client
 
 app = FastAPI(title="FunPlanner API", version="1.0.0")
 
@@ -31,6 +32,12 @@ class PlanRequest(BaseModel):
     weather: dict | None = None
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the shared HTTP connection pool."""
+    await close_client()
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
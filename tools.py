@@ -9,9 +9,14 @@ Uses:
 """
 
 import os
+import asyncio
 import httpx
+import ijson
+import orjson
 import re
+import time
 from datetime import datetime
+from functools import lru_cache
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 SERPAPI_KEY    = os.getenv("SERPAPI_KEY", "")
@@ -19,9 +24,181 @@ SERPAPI_KEY    = os.getenv("SERPAPI_KEY", "")
 # ── Hyderabad geocenter ────────────────────────────────────────────────────────
 HYD_LAT, HYD_LNG = 17.3850, 78.4867
 
-PLACES_BASE  = "https://maps.googleapis.com/maps/api/place"
-MAPS_BASE    = "https://maps.googleapis.com/maps/api/distancematrix"
-SERPAPI_BASE = "https://serpapi.com/search"
+PLACES_BASE    = "https://maps.googleapis.com/maps/api/place"
+PLACES_V1_BASE = "https://places.googleapis.com/v1"
+MAPS_BASE      = "https://maps.googleapis.com/maps/api/distancematrix"
+SERPAPI_BASE   = "https://serpapi.com/search"
+
+# Only the fields the result loops actually consume — the classic endpoint
+# returns the full place payload (photos, hours, reviews…) just to be thrown
+# away, often 5-10x more bytes than this mask.
+_PLACES_FIELD_MASK = (
+    "places.displayName,places.formattedAddress,places.rating,"
+    "places.priceLevel,places.id"
+)
+
+# Constant query parts, encoded once at import — calls merge in only the
+# dynamic fields instead of rebuilding the full param dict every request.
+_SERP_BASE_PARAMS = httpx.QueryParams({
+    "engine":   "google",
+    "api_key":  SERPAPI_KEY,
+    "hl":       "en",
+    "gl":       "in",
+    "location": "Hyderabad, Telangana, India",
+})
+_MAPS_BASE_PARAMS = httpx.QueryParams({
+    "key":   GOOGLE_API_KEY,
+    "mode":  "driving",
+    "units": "metric",
+})
+
+# Places v1 reports price as an enum; map back to the classic 1-4 scale.
+_PRICE_LEVELS = {
+    "PRICE_LEVEL_FREE":           0,
+    "PRICE_LEVEL_INEXPENSIVE":    1,
+    "PRICE_LEVEL_MODERATE":       2,
+    "PRICE_LEVEL_EXPENSIVE":      3,
+    "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED HTTP CLIENT
+# ─────────────────────────────────────────────────────────────────────────────
+# One pooled client for all tools — keep-alive connections to Google/SerpAPI
+# skip the TCP+TLS handshake (~100-300 ms) on every call after the first.
+_CLIENT: httpx.AsyncClient | None = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it lazily on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=15,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _CLIENT
+
+
+async def close_client():
+    """Close the shared client — call on app shutdown."""
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        await _CLIENT.aclose()
+    _CLIENT = None
+
+
+# Concurrency gates: unbounded gather would blow past provider rate limits
+# and trade the parallel speedup for a 429 retry storm.
+_PLACES_SEM = asyncio.Semaphore(8)
+_SERP_SEM   = asyncio.Semaphore(4)
+
+
+async def _request(method: str, url: str, *, sem: asyncio.Semaphore,
+                   retries: int = 2, **kwargs) -> httpx.Response:
+    """Issue a request under a concurrency gate, backing off on 429."""
+    client = await get_client()
+    async with sem:
+        for attempt in range(retries + 1):
+            r = await client.request(method, url, **kwargs)
+            if r.status_code != 429:
+                break
+            await asyncio.sleep(0.5 * 2 ** attempt)
+    return r
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RESPONSE CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+# The agent often reruns a plan with the same queries; Places/Distance data is
+# stable over a session, so repeats within the TTL skip the network entirely.
+_CACHE_TTL = 600          # seconds
+_CACHE_MAX = 512
+_api_cache: dict[tuple, tuple[float, dict]] = {}
+
+
+def _cache_get(key: tuple) -> dict | None:
+    hit = _api_cache.get(key)
+    if hit is None:
+        return None
+    expiry, value = hit
+    if time.monotonic() > expiry:
+        _api_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_put(key: tuple, value: dict):
+    if len(_api_cache) >= _CACHE_MAX:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _api_cache.pop(next(iter(_api_cache)))
+    _api_cache[key] = (time.monotonic() + _CACHE_TTL, value)
+
+
+async def _places_textsearch(query: str, type_: str) -> dict:
+    """
+    Places (v1) text search with a TTL cache keyed on the normalized query.
+    Sends a field mask so Google only returns the fields we consume, then
+    normalizes each place back to the classic results shape callers expect.
+    """
+    key = ("textsearch", query.strip().lower(), type_)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    r = await _request(
+        "POST",
+        f"{PLACES_V1_BASE}/places:searchText",
+        sem=_PLACES_SEM,
+        headers={
+            "X-Goog-Api-Key":    GOOGLE_API_KEY,
+            "X-Goog-FieldMask":  _PLACES_FIELD_MASK,
+        },
+        json={"textQuery": query, "includedType": type_},
+    )
+    raw = orjson.loads(r.content)
+    results = []
+    for p in raw.get("places", []):
+        entry = {
+            "name":     p.get("displayName", {}).get("text", ""),
+            "rating":   p.get("rating", 4.0),
+            "place_id": p.get("id"),
+        }
+        # Leave missing fields out so callers' own .get defaults still apply
+        addr = p.get("formattedAddress")
+        if addr:
+            entry["formatted_address"] = addr
+        level = _PRICE_LEVELS.get(p.get("priceLevel"))
+        if level is not None:
+            entry["price_level"] = level
+        results.append(entry)
+    data = {"results": results}
+    _cache_put(key, data)
+    return data
+
+
+async def _distance_matrix(origins: str, destinations: str) -> dict:
+    """
+    Distance Matrix lookup with a TTL cache keyed on the normalized params.
+    origins/destinations are the raw API params — pipe-joined for batches.
+    """
+    key = ("distmatrix", origins.strip().lower(), destinations.strip().lower())
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    r = await _request(
+        "GET",
+        f"{MAPS_BASE}/json",
+        sem=_PLACES_SEM,
+        params=_MAPS_BASE_PARAMS.merge({
+            "origins":      origins,
+            "destinations": destinations,
+        }),
+    )
+    data = orjson.loads(r.content)
+    _cache_put(key, data)
+    return data
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -35,78 +212,129 @@ async def search_restaurants(
     user_lat: float = None,
     user_lng: float = None,
     radius_km: int = 8,
+    origin_for_travel: str = None,
 ) -> list[dict]:
     """
     Search Google Places for restaurants near the user's location.
     Uses nearbysearch (radius-based) when GPS coords available,
     falls back to textsearch otherwise.
+    When origin_for_travel is set, each result also carries a "travel"
+    dict (distance/duration/fare from that origin), fetched in parallel.
     """
     if not GOOGLE_API_KEY:
-        return _mock_restaurants(area, max_budget_per_person)
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        if user_lat and user_lng:
-            # Nearby search — sorted by proximity to user
-            params = {
-                "location": f"{user_lat},{user_lng}",
-                "radius":   radius_km * 1000,
-                "type":     "restaurant",
-                "key":      GOOGLE_API_KEY,
-            }
-            if cuisine:
-                params["keyword"] = cuisine
-            r = await client.get(f"{PLACES_BASE}/nearbysearch/json", params=params)
-        else:
-            query = f"{cuisine} restaurant in {area} Hyderabad"
-            r = await client.get(
-                f"{PLACES_BASE}/textsearch/json",
-                params={"query": query, "key": GOOGLE_API_KEY, "type": "restaurant"},
-            )
-    data = r.json()
+        data = {"results": []}        # fall through to the mock fallback below
+    elif user_lat and user_lng:
+        # Nearby search — sorted by proximity to user
+        params = {
+            "location": f"{user_lat},{user_lng}",
+            "radius":   radius_km * 1000,
+            "type":     "restaurant",
+            "key":      GOOGLE_API_KEY,
+        }
+        if cuisine:
+            params["keyword"] = cuisine
+        r = await _request("GET", f"{PLACES_BASE}/nearbysearch/json",
+                           sem=_PLACES_SEM, params=params)
+        data = orjson.loads(r.content)
+    else:
+        query = f"{cuisine} restaurant in {area} Hyderabad"
+        data = await _places_textsearch(query, "restaurant")
     results = []
+    cost_threshold = max_budget_per_person * 0.45    # skip if too pricey
     for p in data.get("results", [])[:limit]:
-        price_level = p.get("price_level", 2)          # 1-4 Google scale
-        # Rough INR estimate per person
-        cost_map = {1: 150, 2: 350, 3: 600, 4: 1200}
-        est_cost = cost_map.get(price_level, 350)
-        if est_cost > max_budget_per_person * 0.45:      # skip if too pricey
+        g = p.get                                      # bind method once per result
+        price_level = g("price_level", 2)              # 1-4 Google scale
+        est_cost = _COST_MAP.get(price_level, 350)
+        if est_cost > cost_threshold:
             continue
+        pid = g("place_id")
         results.append({
-            "name":           p.get("name"),
-            "address":        p.get("formatted_address", area),
-            "rating":         p.get("rating", 4.0),
+            "name":           g("name"),
+            "address":        g("formatted_address", area),
+            "rating":         g("rating", 4.0),
             "price_level":    price_level,
             "estimated_cost": est_cost,
-            "maps_url": f"https://www.google.com/maps/place/?q=place_id:{p.get('place_id')}",
-            "place_id":       p.get("place_id"),
+            "maps_url":       f"https://www.google.com/maps/place/?q=place_id:{pid}",
+            "place_id":       pid,
         })
-    return results or _mock_restaurants(area, max_budget_per_person)
+    results = results or _mock_restaurants(area, max_budget_per_person)
+    if origin_for_travel and results:
+        # Fan out one Distance Matrix lookup per candidate — N round-trips
+        # overlap into the latency of the slowest one.
+        travel_infos = await asyncio.gather(
+            *(get_travel_info(origin_for_travel, r["address"]) for r in results)
+        )
+        results = [{**r, "travel": ti} for r, ti in zip(results, travel_infos)]
+    return results
+
+
+# Rough INR estimate per person for each Google price level (1-4 scale)
+_COST_MAP = {1: 150, 2: 350, 3: 600, 4: 1200}
+
+# Optional LLVM-compiled bulk filter. For the per-request result sets here
+# (<=10 items) the plain comprehension is just as fast, but batch flows that
+# score thousands of candidates get a vectorized mask when numba is installed.
+try:
+    import numpy as _np
+    from numba import njit as _njit
+
+    @_njit(cache=True)
+    def _budget_mask(costs, threshold):
+        return costs <= threshold
+
+    def _filter_by_budget(items, key: str, threshold: float) -> list[dict]:
+        """Keep items whose `key` cost is within threshold (SoA + SIMD)."""
+        costs = _np.array([item[key] for item in items], dtype=_np.float64)
+        return [item for item, keep in zip(items, _budget_mask(costs, threshold)) if keep]
+
+except ImportError:      # numba/numpy not installed — plain Python fallback
+    def _filter_by_budget(items, key: str, threshold: float) -> list[dict]:
+        """Keep items whose `key` cost is within threshold."""
+        return [item for item in items if item[key] <= threshold]
+
+# Mock fallback data, built once at import — never mutate these in place.
+_MOCK_RESTAURANTS = (
+    {"name": "Paradise Biryani", "address": "MG Road, Secunderabad", "rating": 4.4,
+     "estimated_cost": 320, "maps_url": "https://maps.google.com/?q=Paradise+Biryani+Hyderabad"},
+    {"name": "Bawarchi Restaurant", "address": "RTC X Roads, Hyderabad", "rating": 4.3,
+     "estimated_cost": 280, "maps_url": "https://maps.google.com/?q=Bawarchi+Hyderabad"},
+    {"name": "Rayalaseema Ruchulu", "address": "Banjara Hills, Hyderabad", "rating": 4.2,
+     "estimated_cost": 350, "maps_url": "https://maps.google.com/?q=Rayalaseema+Ruchulu+Hyderabad"},
+    {"name": "AB's – Absolute Barbecues", "address": "Jubilee Hills, Hyderabad", "rating": 4.5,
+     "estimated_cost": 700, "maps_url": "https://maps.google.com/?q=AB%27s+Absolute+Barbecues+Hyderabad"},
+    {"name": "Ohri's Jiva Imperia", "address": "Basheer Bagh, Hyderabad", "rating": 4.1,
+     "estimated_cost": 600, "maps_url": "https://maps.google.com/?q=Ohri%27s+Hyderabad"},
+    {"name": "Shah Ghouse Cafe", "address": "Tolichowki, Hyderabad", "rating": 4.5,
+     "estimated_cost": 200, "maps_url": "https://maps.google.com/?q=Shah+Ghouse+Hyderabad"},
+    {"name": "Chutneys", "address": "Banjara Hills, Hyderabad", "rating": 4.3,
+     "estimated_cost": 250, "maps_url": "https://maps.google.com/?q=Chutneys+Hyderabad"},
+)
 
 
 def _mock_restaurants(area: str, budget: int) -> list[dict]:
     """Fallback mock data when no API key provided."""
-    all_restaurants = [
-        {"name": "Paradise Biryani", "address": "MG Road, Secunderabad", "rating": 4.4,
-         "estimated_cost": 320, "maps_url": "https://maps.google.com/?q=Paradise+Biryani+Hyderabad"},
-        {"name": "Bawarchi Restaurant", "address": "RTC X Roads, Hyderabad", "rating": 4.3,
-         "estimated_cost": 280, "maps_url": "https://maps.google.com/?q=Bawarchi+Hyderabad"},
-        {"name": "Rayalaseema Ruchulu", "address": "Banjara Hills, Hyderabad", "rating": 4.2,
-         "estimated_cost": 350, "maps_url": "https://maps.google.com/?q=Rayalaseema+Ruchulu+Hyderabad"},
-        {"name": "AB's – Absolute Barbecues", "address": "Jubilee Hills, Hyderabad", "rating": 4.5,
-         "estimated_cost": 700, "maps_url": "https://maps.google.com/?q=AB%27s+Absolute+Barbecues+Hyderabad"},
-        {"name": "Ohri's Jiva Imperia", "address": "Basheer Bagh, Hyderabad", "rating": 4.1,
-         "estimated_cost": 600, "maps_url": "https://maps.google.com/?q=Ohri%27s+Hyderabad"},
-        {"name": "Shah Ghouse Cafe", "address": "Tolichowki, Hyderabad", "rating": 4.5,
-         "estimated_cost": 200, "maps_url": "https://maps.google.com/?q=Shah+Ghouse+Hyderabad"},
-        {"name": "Chutneys", "address": "Banjara Hills, Hyderabad", "rating": 4.3,
-         "estimated_cost": 250, "maps_url": "https://maps.google.com/?q=Chutneys+Hyderabad"},
-    ]
-    return [r for r in all_restaurants if r["estimated_cost"] <= budget * 0.5][:4]
+    return _filter_by_budget(_MOCK_RESTAURANTS, "estimated_cost", budget * 0.5)[:4]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 2. MOVIES
 # ─────────────────────────────────────────────────────────────────────────────
+class _StreamReader:
+    """Async file-like adapter over an httpx byte stream, for ijson."""
+
+    def __init__(self, aiter):
+        self._aiter = aiter
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:          # ijson probes with read(0) to sniff the data type
+            return b""
+        try:
+            return await self._aiter.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+
 async def search_movies(
     preferred_genre: str = "",
     max_ticket_price: int = 400,
@@ -119,36 +347,40 @@ async def search_movies(
     if not SERPAPI_KEY:
         return _mock_movies(preferred_genre, max_ticket_price)
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        r = await client.get(
-            SERPAPI_BASE,
-            params={
-                "engine":    "google",
-                "q":         f"movies showing today in Hyderabad cinemas {preferred_genre}",
-                "api_key":   SERPAPI_KEY,
-                "hl":        "en",
-                "gl":        "in",
-                "location":  "Hyderabad, Telangana, India",
-            },
-        )
-    data = r.json()
-
+    client = await get_client()
     results = []
-    # SerpAPI showtimes_results or knowledge graph
-    for m in data.get("showtimes", [])[:limit]:
-        results.append({
-            "title":    m.get("name", "Unknown"),
-            "theatre":  "PVR / INOX / AMB Cinemas",
-            "genre":    preferred_genre or "Drama",
-            "rating":   m.get("rating", "7.5/10"),
-            "ticket_price": _estimate_ticket_price(max_ticket_price),
-            "duration": m.get("duration", "2h 30m"),
-            "bookmyshow_url": "https://in.bookmyshow.com",
-        })
+    ticket_price = _estimate_ticket_price(max_ticket_price)
+    async with _SERP_SEM:
+        async with client.stream(
+            "GET",
+            SERPAPI_BASE,
+            params=_SERP_BASE_PARAMS.merge(
+                {"q": f"movies showing today in Hyderabad cinemas {preferred_genre}"}
+            ),
+        ) as r:
+            # SerpAPI payloads run to hundreds of KB of knowledge-graph data;
+            # parse showtimes incrementally and stop once we have enough.
+            reader = _StreamReader(r.aiter_bytes())
+            try:
+                async for m in ijson.items(reader, "showtimes.item"):
+                    results.append({
+                        "title":    m.get("name", "Unknown"),
+                        "theatre":  "PVR / INOX / AMB Cinemas",
+                        "genre":    preferred_genre or "Drama",
+                        "rating":   m.get("rating", "7.5/10"),
+                        "ticket_price": ticket_price,
+                        "duration": m.get("duration", "2h 30m"),
+                        "bookmyshow_url": "https://in.bookmyshow.com",
+                    })
+                    if len(results) >= limit:
+                        break
+            except ijson.IncompleteJSONError:
+                pass    # truncated/odd payload — keep whatever parsed
 
     return results or _mock_movies(preferred_genre, max_ticket_price)
 
 
+@lru_cache(maxsize=256)
 def _estimate_ticket_price(max_price: int) -> int:
     if max_price >= 400:
         return 350   # premium
@@ -157,19 +389,21 @@ def _estimate_ticket_price(max_price: int) -> int:
     return 150       # matinee / balcony
 
 
+_MOCK_MOVIES = (
+    {"title": "Check BookMyShow for Latest Shows", "theatre": "AMB Cinemas, Gachibowli",
+     "genre": "Action", "rating": "8.1/10", "ticket_price": 300, "duration": "2h 25m",
+     "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
+    {"title": "PVR Inorbit – Current Blockbuster", "theatre": "PVR Inorbit Mall, HITEC City",
+     "genre": "Thriller", "rating": "7.8/10", "ticket_price": 350, "duration": "2h 10m",
+     "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
+    {"title": "INOX GVK One – Matinee Show", "theatre": "INOX GVK One, Banjara Hills",
+     "genre": "Comedy", "rating": "7.2/10", "ticket_price": 200, "duration": "1h 55m",
+     "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
+)
+
+
 def _mock_movies(genre: str, budget: int) -> list[dict]:
-    movies = [
-        {"title": "Check BookMyShow for Latest Shows", "theatre": "AMB Cinemas, Gachibowli",
-         "genre": "Action", "rating": "8.1/10", "ticket_price": 300, "duration": "2h 25m",
-         "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
-        {"title": "PVR Inorbit – Current Blockbuster", "theatre": "PVR Inorbit Mall, HITEC City",
-         "genre": "Thriller", "rating": "7.8/10", "ticket_price": 350, "duration": "2h 10m",
-         "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
-        {"title": "INOX GVK One – Matinee Show", "theatre": "INOX GVK One, Banjara Hills",
-         "genre": "Comedy", "rating": "7.2/10", "ticket_price": 200, "duration": "1h 55m",
-         "bookmyshow_url": "https://in.bookmyshow.com/movies/hyderabad"},
-    ]
-    return [m for m in movies if m["ticket_price"] <= budget][:3]
+    return _filter_by_budget(_MOCK_MOVIES, "ticket_price", budget)[:3]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -208,74 +442,91 @@ async def search_places(
             place_type = v
             break
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        if user_lat and user_lng:
-            # Nearby search — radius 10km, sorted by proximity
-            params = {
-                "location": f"{user_lat},{user_lng}",
-                "radius":   radius_km * 1000,
-                "type":     place_type,
-                "key":      GOOGLE_API_KEY,
-                "keyword":  interests,
-            }
-            r = await client.get(f"{PLACES_BASE}/nearbysearch/json", params=params)
-        else:
-            query = f"{interests} attractions in {area} Hyderabad"
-            r = await client.get(
-                f"{PLACES_BASE}/textsearch/json",
-                params={"query": query, "key": GOOGLE_API_KEY, "type": place_type},
-            )
-    data = r.json()
+    if user_lat and user_lng:
+        # Nearby search — radius 10km, sorted by proximity
+        params = {
+            "location": f"{user_lat},{user_lng}",
+            "radius":   radius_km * 1000,
+            "type":     place_type,
+            "key":      GOOGLE_API_KEY,
+            "keyword":  interests,
+        }
+        r = await _request("GET", f"{PLACES_BASE}/nearbysearch/json",
+                           sem=_PLACES_SEM, params=params)
+        data = orjson.loads(r.content)
+    else:
+        query = f"{interests} attractions in {area} Hyderabad"
+        data = await _places_textsearch(query, place_type)
     results = []
     for p in data.get("results", [])[:limit]:
+        g = p.get                                      # bind method once per result
+        name = g("name", "")
         results.append({
-            "name":       p.get("name"),
-            "address":    p.get("formatted_address", area),
-            "rating":     p.get("rating", 4.0),
-            "entry_fee":  _estimate_entry_fee(p.get("name", "")),
-            "maps_url":   f"https://www.google.com/maps/place/?q=place_id:{p.get('place_id')}",
+            "name":       name,
+            "address":    g("formatted_address", area),
+            "rating":     g("rating", 4.0),
+            "entry_fee":  _estimate_entry_fee(name),
+            "maps_url":   f"https://www.google.com/maps/place/?q=place_id:{g('place_id')}",
             "visit_duration_mins": 60,
         })
     return results or _mock_places(interests, max_entry_fee)
 
 
+# Rough entry fees for known Hyderabad spots, matched as substrings of names.
+_FEE_MAP = {
+    "golconda": 35, "charminar": 25, "ramoji": 1150,
+    "birla": 0, "hussain sagar": 0, "lumbini": 50,
+    "nehru zoo": 80, "salar jung": 20, "qutb shahi": 15,
+    "snow world": 799, "wonderla": 999,
+}
+
+# One compiled alternation: a single C-level scan replaces a Python-level
+# `in`-test per landmark. google-re2 compiles it to a true linear-time DFA
+# whose per-character cost stays flat as the table grows; stdlib re is the
+# fallback when the binding isn't installed. Longest keys first so a longer
+# landmark name wins over a prefix of it.
+try:
+    import re2 as _fee_re_engine
+except ImportError:
+    _fee_re_engine = re
+
+_FEE_RE = _fee_re_engine.compile(
+    "|".join(re.escape(k) for k in sorted(_FEE_MAP, key=len, reverse=True))
+)
+
+
 def _estimate_entry_fee(name: str) -> int:
     """Rough entry fee lookup for known Hyderabad spots."""
-    fee_map = {
-        "golconda": 35, "charminar": 25, "ramoji": 1150,
-        "birla": 0, "hussain sagar": 0, "lumbini": 50,
-        "nehru zoo": 80, "salar jung": 20, "qutb shahi": 15,
-        "snow world": 799, "wonderla": 999,
-    }
-    name_lower = name.lower()
-    for k, v in fee_map.items():
-        if k in name_lower:
-            return v
+    m = _FEE_RE.search(name.lower())
+    if m:
+        return _FEE_MAP[m.group(0)]
     return 50   # default assumption
 
 
+_MOCK_PLACES = (
+    {"name": "Hussain Sagar Lake & Tank Bund", "address": "Tank Bund Road, Hyderabad",
+     "rating": 4.3, "entry_fee": 0, "visit_duration_mins": 60,
+     "maps_url": "https://maps.google.com/?q=Hussain+Sagar+Lake"},
+    {"name": "Golconda Fort", "address": "Ibrahim Bagh, Hyderabad",
+     "rating": 4.4, "entry_fee": 35, "visit_duration_mins": 90,
+     "maps_url": "https://maps.google.com/?q=Golconda+Fort"},
+    {"name": "Charminar", "address": "Charminar, Old City, Hyderabad",
+     "rating": 4.5, "entry_fee": 25, "visit_duration_mins": 60,
+     "maps_url": "https://maps.google.com/?q=Charminar+Hyderabad"},
+    {"name": "Lumbini Park", "address": "Secretariat Road, Hyderabad",
+     "rating": 4.1, "entry_fee": 50, "visit_duration_mins": 60,
+     "maps_url": "https://maps.google.com/?q=Lumbini+Park+Hyderabad"},
+    {"name": "Birla Mandir", "address": "Naubath Pahad, Hyderabad",
+     "rating": 4.6, "entry_fee": 0, "visit_duration_mins": 45,
+     "maps_url": "https://maps.google.com/?q=Birla+Mandir+Hyderabad"},
+    {"name": "Inorbit Mall", "address": "HITEC City, Hyderabad",
+     "rating": 4.3, "entry_fee": 0, "visit_duration_mins": 120,
+     "maps_url": "https://maps.google.com/?q=Inorbit+Mall+Hyderabad"},
+)
+
+
 def _mock_places(interests: str, budget: int) -> list[dict]:
-    all_places = [
-        {"name": "Hussain Sagar Lake & Tank Bund", "address": "Tank Bund Road, Hyderabad",
-         "rating": 4.3, "entry_fee": 0, "visit_duration_mins": 60,
-         "maps_url": "https://maps.google.com/?q=Hussain+Sagar+Lake"},
-        {"name": "Golconda Fort", "address": "Ibrahim Bagh, Hyderabad",
-         "rating": 4.4, "entry_fee": 35, "visit_duration_mins": 90,
-         "maps_url": "https://maps.google.com/?q=Golconda+Fort"},
-        {"name": "Charminar", "address": "Charminar, Old City, Hyderabad",
-         "rating": 4.5, "entry_fee": 25, "visit_duration_mins": 60,
-         "maps_url": "https://maps.google.com/?q=Charminar+Hyderabad"},
-        {"name": "Lumbini Park", "address": "Secretariat Road, Hyderabad",
-         "rating": 4.1, "entry_fee": 50, "visit_duration_mins": 60,
-         "maps_url": "https://maps.google.com/?q=Lumbini+Park+Hyderabad"},
-        {"name": "Birla Mandir", "address": "Naubath Pahad, Hyderabad",
-         "rating": 4.6, "entry_fee": 0, "visit_duration_mins": 45,
-         "maps_url": "https://maps.google.com/?q=Birla+Mandir+Hyderabad"},
-        {"name": "Inorbit Mall", "address": "HITEC City, Hyderabad",
-         "rating": 4.3, "entry_fee": 0, "visit_duration_mins": 120,
-         "maps_url": "https://maps.google.com/?q=Inorbit+Mall+Hyderabad"},
-    ]
-    return [p for p in all_places if p["entry_fee"] <= budget * 0.15][:4]
+    return _filter_by_budget(_MOCK_PLACES, "entry_fee", budget * 0.15)[:4]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -289,39 +540,60 @@ async def get_travel_info(
     Get realistic travel time and cab fare estimate between two Hyderabad locations.
     Uses Google Distance Matrix API if key available, else heuristic estimate.
     """
+    rows = await get_travel_info_batch([origin], [destination])
+    return rows[0][0]
+
+
+async def get_travel_info_batch(
+    origins: list[str],
+    destinations: list[str],
+) -> list[list[dict]]:
+    """
+    Travel estimates for every origin×destination pair in ONE Distance Matrix
+    request — the API takes up to 25 origins and 25 destinations per call, so
+    N pairs cost a single network round-trip. Returns a 2D list indexed
+    [origin][destination]; pairs the API can't resolve fall back to the
+    heuristic estimate.
+    """
     if not GOOGLE_API_KEY:
-        return _mock_travel(origin, destination)
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(
-            f"{MAPS_BASE}/json",
-            params={
-                "origins":      f"{origin}, Hyderabad",
-                "destinations": f"{destination}, Hyderabad",
-                "key":          GOOGLE_API_KEY,
-                "mode":         "driving",
-                "units":        "metric",
-            },
-        )
-    data = r.json()
+        return [[_mock_travel(o, d) for d in destinations] for o in origins]
+
+    data = await _distance_matrix(
+        "|".join(f"{o}, Hyderabad" for o in origins),
+        "|".join(f"{d}, Hyderabad" for d in destinations),
+    )
     try:
-        element     = data["rows"][0]["elements"][0]
-        distance_km = element["distance"]["value"] / 1000
-        duration_min = element["duration"]["value"] // 60
-        fare        = _estimate_cab_fare(distance_km)
-        return {
-            "distance_km":   round(distance_km, 1),
-            "duration_mins": duration_min,
-            "cab_fare_inr":  fare,
-            "mode":          "Uber/Ola",
-        }
+        rows = []
+        for i, o in enumerate(origins):
+            row = []
+            for j, d in enumerate(destinations):
+                element = data["rows"][i]["elements"][j]
+                if element.get("status", "OK") != "OK":
+                    row.append(_mock_travel(o, d))
+                    continue
+                distance_km  = element["distance"]["value"] / 1000
+                duration_min = element["duration"]["value"] // 60
+                row.append({
+                    "distance_km":   round(distance_km, 1),
+                    "duration_mins": duration_min,
+                    "cab_fare_inr":  _estimate_cab_fare(distance_km),
+                    "mode":          "Uber/Ola",
+                })
+            rows.append(row)
+        return rows
     except (KeyError, IndexError):
-        return _mock_travel(origin, destination)
+        return [[_mock_travel(o, d) for d in destinations] for o in origins]
+
+
+@lru_cache(maxsize=256)
+def _cab_fare_cached(round_km: float) -> int:
+    return int(50 + round_km * 12)
 
 
 def _estimate_cab_fare(km: float) -> int:
     """Approx Uber/Ola fare: ₹50 base + ₹12/km."""
-    return int(50 + km * 12)
+    # Quantize to 0.1 km so repeat distances hit the cache
+    return _cab_fare_cached(round(km, 1))
 
 
 def _mock_travel(origin: str, destination: str) -> dict:
@@ -337,7 +609,9 @@ def _mock_travel(origin: str, destination: str) -> dict:
 # ─────────────────────────────────────────────────────────────────────────────
 # TOOL DEFINITIONS for Claude
 # ─────────────────────────────────────────────────────────────────────────────
-TOOL_DEFINITIONS = [
+# Frozen at import: a tuple so nothing mutates the schemas at runtime, plus
+# pre-serialized JSON bytes for callers that only ship them over the wire.
+TOOL_DEFINITIONS = (
     {
         "name": "search_restaurants",
         "description": (
@@ -355,6 +629,7 @@ TOOL_DEFINITIONS = [
                 "user_lat":               {"type": "number", "description": "User GPS latitude — pass this to get nearby results"},
                 "user_lng":               {"type": "number", "description": "User GPS longitude — pass this to get nearby results"},
                 "radius_km":              {"type": "integer", "description": "Search radius in km (default 8)"},
+                "origin_for_travel":      {"type": "string", "description": "Optional starting location — when set, each result includes travel time/fare from here"},
             },
             "required": ["area", "max_budget_per_person"],
         },
@@ -411,28 +686,79 @@ TOOL_DEFINITIONS = [
             "required": ["origin", "destination"],
         },
     },
-]
+)
+
+TOOL_DEFINITIONS_JSON: bytes = orjson.dumps(TOOL_DEFINITIONS)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TOOL EXECUTOR
 # ─────────────────────────────────────────────────────────────────────────────
-async def execute_tool(tool_name: str, tool_input: dict) -> str:
-    """Dispatch a tool call and return JSON string result."""
+# Name → coroutine table: one hash lookup per dispatch, and adding a tool is
+# a single entry here plus its TOOL_DEFINITIONS schema.
+_TOOL_DISPATCH = {
+    "search_restaurants": search_restaurants,
+    "search_movies":      search_movies,
+    "search_places":      search_places,
+    "get_travel_info":    get_travel_info,
+}
+
+
+async def _run_tool(tool_name: str, tool_input: dict) -> str:
+    """Run one tool call and return its JSON string result."""
     try:
-        if tool_name == "search_restaurants":
-            result = await search_restaurants(**tool_input)
-        elif tool_name == "search_movies":
-            result = await search_movies(**tool_input)
-        elif tool_name == "search_places":
-            result = await search_places(**tool_input)
-        elif tool_name == "get_travel_info":
-            result = await get_travel_info(**tool_input)
-        else:
+        fn = _TOOL_DISPATCH.get(tool_name)
+        if fn is None:
             result = {"error": f"Unknown tool: {tool_name}"}
-        return json.dumps(result, ensure_ascii=False)
+        else:
+            result = await fn(**tool_input)
+        return orjson.dumps(result).decode()
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return orjson.dumps({"error": str(e)}).decode()
+
 
+# Single-flight map: concurrent identical calls share one in-flight result
+# instead of issuing duplicate API requests. The TTL cache catches sequential
+# repeats; this catches simultaneous ones.
+_INFLIGHT: dict[tuple, asyncio.Future] = {}
 
-import json
+
+async def _dispatch(tool_name: str, tool_input: dict) -> str:
+    """Run one tool call, coalescing concurrent duplicates onto one result."""
+    key = (tool_name, orjson.dumps(tool_input, option=orjson.OPT_SORT_KEYS))
+    pending = _INFLIGHT.get(key)
+    if pending is not None:
+        return await pending
+    fut = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = fut
+    try:
+        result = await _run_tool(tool_name, tool_input)
+        fut.set_result(result)
+        return result
+    except BaseException:          # e.g. cancellation — never strand waiters
+        if not fut.done():
+            fut.cancel()
+        raise
+    finally:
+        _INFLIGHT.pop(key, None)
+
+
+async def execute_tool(tool_name: str, tool_input: dict) -> str:
+    """Dispatch a single tool call and return JSON string result."""
+    return await _dispatch(tool_name, tool_input)
+
+
+async def execute_tools(calls: list[tuple[str, dict]]) -> list[str]:
+    """
+    Execute a batch of tool calls concurrently.
+    The agent often requests restaurants + movies + places + travel in one
+    turn; gathering them collapses wall time to the slowest single call.
+    """
+    results = await asyncio.gather(
+        *(_dispatch(name, inp) for name, inp in calls),
+        return_exceptions=True,
+    )
+    return [
+        r if isinstance(r, str) else orjson.dumps({"error": str(r)}).decode()
+        for r in results
+    ]